@@ -6,10 +6,17 @@ Professional salary breakdown calculator for Indian companies
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 from io import BytesIO
+from collections import namedtuple
 import json
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard json module is used instead
+    orjson = None
+
 # =====================================================
 # CONFIGURATION & DEFAULTS
 # =====================================================
@@ -26,35 +33,228 @@ DEFAULT_PERCENTAGES = {
 # HRA rates based on city type
 METRO_HRA_RATE = 0.50       # 50% of Basic for Metro cities
 NON_METRO_HRA_RATE = 0.40   # 40% of Basic for Non-Metro cities
+_HRA_BY_CITY = {"Metro": METRO_HRA_RATE, "Non-Metro": NON_METRO_HRA_RATE}
+
+# Breakup components in display order
+BREAKUP_COMPONENTS = (
+    'Basic Salary', 'HRA', 'Special Allowance', 'Employer PF',
+    'Gratuity', 'Bonus/Variable', 'LTA/Other Benefits',
+)
+BASIC_IDX, HRA_IDX, SPECIAL_IDX, PF_IDX = 0, 1, 2, 3
+
+# Column-wise breakup: component names with matching amount/percentage arrays
+Breakup = namedtuple('Breakup', 'names amounts percentages')
 
 # Validation limits
 MIN_CTC = 10000         # Minimum CTC in rupees
 MAX_CTC = 100000000     # Maximum CTC in rupees (10 crores)
 
-# Component limits (as percentages)
-COMPONENT_LIMITS = {
-    'basic': {'min': 30.0, 'max': 60.0},
-    'hra': {'min': 20.0, 'max': 60.0},    # as % of basic
-    'pf': {'min': 8.0, 'max': 15.0},
-    'gratuity': {'min': 3.0, 'max': 6.0},
-    'bonus': {'min': 0.0, 'max': 20.0},
-    'lta': {'min': 0.0, 'max': 10.0},
+# Pre-formatted validation messages
+_CTC_LO_MSG = f"CTC amount seems too low (minimum ₹{MIN_CTC:,})"
+_CTC_HI_MSG = f"CTC amount seems too high (maximum ₹{MAX_CTC:,})"
+
+# Percentage checks in validate_inputs argument order: (zero allowed, message)
+_PCT_CHECKS = (
+    (False, "Basic salary percentage must be between 0-100%"),
+    (True, "PF percentage must be between 0-100%"),
+    (True, "Gratuity percentage must be between 0-100%"),
+    (True, "Bonus percentage must be between 0-100%"),
+    (True, "LTA percentage must be between 0-100%"),
+)
+
+# =====================================================
+# STATIC PAGE CONTENT
+# =====================================================
+
+# Custom CSS for better styling
+_CSS_BLOCK = """
+<style>
+.main-header {
+    background: linear-gradient(90deg, #4CAF50, #45a049);
+    padding: 1rem;
+    border-radius: 10px;
+    color: white;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.metric-card {
+    background: #f0f2f6;
+    padding: 1rem;
+    border-radius: 10px;
+    border-left: 4px solid #4CAF50;
+}
+.results-table {
+    border: 1px solid #ddd;
+    border-radius: 10px;
+    overflow: hidden;
+}
+.results-table table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 0;
+}
+.warning-box {
+    background: #fff3cd;
+    border: 1px solid #ffeaa7;
+    border-radius: 5px;
+    padding: 1rem;
+    margin: 1rem 0;
 }
+.streamlit-info {
+    background: #263238; /* blue-gray background */
+    border-left: 4px solid #00acc1;  /* cyan accent */
+    padding: 1rem;
+    margin: 1rem 0;
+    border-radius: 5px;
+    color: #e0f7fa;  /* Light text for readability */
+}
+</style>
+"""
+
+# Page header
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>💰 CTC Breakup Calculator</h1>
+    <p>Calculate detailed Cost to Company breakdown with Indian salary standards</p>
+    <small>🌟 Hosted on Streamlit Cloud - Always Available</small>
+</div>
+"""
+
+# Streamlit Cloud information banner
+_INFO_BANNER = """
+<div class="streamlit-info">
+    <h4>🌟  Online CTC Calculator!</h4>
+    <p>✅ Easier calculation of pesky salaries <br>
+    📱 Share this URL with anyone<br>
+    💾 Download reports anytime<br>
+    🔄 Now know exacly what 30 LPA means </p>
+</div>
+"""
+
+# Sidebar app info
+_SIDEBAR_FEATURES = """
+**Features:**
+• Always online (24/7)
+• Real-time calculations
+• Export to PDF/CSV/JSON
+• Mobile-friendly design
+• Professional reports
+"""
+
+# Formulas and explanations
+_FORMULAS_MD = """
+### 🧮 Calculation Formulas
+
+**Basic Components:**
+- **Basic Salary** = CTC × Basic %
+- **HRA** = Basic Salary × HRA Rate
+  - 🏙️ Metro: 50% of Basic
+  - 🌆 Non-Metro: 40% of Basic
 
-# Metro cities list
-METRO_CITIES = [
-    'Mumbai', 'Delhi', 'Bangalore', 'Kolkata', 'Chennai', 'Hyderabad',
-    'Pune', 'Ahmedabad', 'Surat', 'Kanpur', 'Jaipur', 'Lucknow',
-    'Nagpur', 'Indore', 'Thane', 'Bhopal', 'Visakhapatnam', 'Pimpri-Chinchwad'
-]
+**Statutory Components:**
+- **Employer PF** = Basic Salary × 12%
+- **Gratuity** = Basic Salary × 4.81%
+
+**Benefits & Allowances:**
+- **Bonus/Variable** = CTC × Bonus %
+- **LTA/Other Benefits** = CTC × LTA %
+
+**Balancing Figure:**
+- **Special Allowance** = CTC - (Sum of all other components)
+
+### 📋 Important Notes:
+
+1. **HRA Calculation**: Based on city classification (Metro vs Non-Metro)
+2. **PF & Gratuity**: Always calculated on Basic Salary
+3. **Special Allowance**: Automatically balances to make total = CTC
+4. **Tax Implications**: Higher Special Allowance = Higher tax burden
+5. **Take-Home Estimate**: Excludes employee PF, professional tax, and income tax
+
+### 🎯 Optimization Tips:
+
+- **Increase Basic**: Higher PF contribution, better retirement corpus
+- **Optimize HRA**: Claim house rent allowance for tax benefits
+- **Balance Special Allowance**: Keep under 30% for better tax efficiency
+- **Utilize Benefits**: LTA and other allowances have tax advantages
+"""
+
+# Footer columns
+_FOOTER_BUILT_WITH = """
+**🔧 Built with:**
+- Streamlit for UI
+- Python for calculations
+- Pandas for data handling
+- FPDF2 for PDF reports
+"""
+
+_FOOTER_FEATURES = """
+**📊 Features:**
+- Real-time calculations
+- Export to CSV/PDF/JSON
+- Mobile-friendly design
+- Always online (24/7)
+"""
+
+_FOOTER_STANDARDS = """
+**🇮🇳 Indian Standards:**
+- PF regulations compliant
+- Metro/Non-Metro HRA rates
+- Statutory benefits included
+"""
+
+# Usage tip below the footer
+_FOOTER_HTML = """
+<div style="text-align: center; color: #666; font-size: 12px; margin-top: 20px;">
+    💡 Tip: Bookmark this page for quick access to CTC calculations anytime!
+</div>
+"""
 
 # =====================================================
 # UTILITY FUNCTIONS
 # =====================================================
 
-def calculate_ctc_breakup(ctc_amount, city_type, basic_percent=None, hra_percent=None,
-                         pf_percent=None, gratuity_percent=None, bonus_percent=None, lta_percent=None):
-    """Calculate detailed CTC breakup"""
+def _compute_amounts(ctc, basic_p, hra_rate, pf_p, grat_p, bonus_p, lta_p):
+    """Compute CTC component amounts in BREAKUP_COMPONENTS order"""
+    basic = ctc * (basic_p / 100)
+    hra = basic * hra_rate
+    pf = basic * (pf_p / 100)
+    grat = basic * (grat_p / 100)
+    bonus = ctc * (bonus_p / 100)
+    lta = ctc * (lta_p / 100)
+
+    # Special allowance is the balancing figure, clamped at zero with a plain
+    # comparison (lowered to a single maxsd under Numba) instead of max()
+    special = ctc - (basic + hra + pf + grat + bonus + lta)
+    if special < 0.0:
+        special = 0.0
+
+    out = np.empty(7)
+    out[0] = basic
+    out[1] = hra
+    out[2] = special
+    out[3] = pf
+    out[4] = grat
+    out[5] = bonus
+    out[6] = lta
+    return out
+
+@st.cache_resource(show_spinner=False)
+def _get_amounts_kernel():
+    """Compile _compute_amounts with Numba once per server process
+
+    Falls back to the plain-Python function if Numba is not installed.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return _compute_amounts
+    return njit('float64[:](float64, float64, float64, float64, float64, float64, float64)',
+                cache=True)(_compute_amounts)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def compute_breakup_arrays(ctc_amount, city_type, basic_percent=None, hra_percent=None,
+                           pf_percent=None, gratuity_percent=None, bonus_percent=None, lta_percent=None):
+    """Calculate rounded component amounts and percentages in BREAKUP_COMPONENTS order"""
 
     # Use defaults if not provided
     basic_percent = basic_percent or DEFAULT_PERCENTAGES['basic']
@@ -64,161 +264,212 @@ def calculate_ctc_breakup(ctc_amount, city_type, basic_percent=None, hra_percent
     lta_percent = lta_percent or DEFAULT_PERCENTAGES['lta']
 
     # Calculate HRA rate based on city type if not provided
-    if hra_percent is None:
-        hra_rate = METRO_HRA_RATE if city_type == "Metro" else NON_METRO_HRA_RATE
-    else:
-        hra_rate = hra_percent
-
-    # Calculate components
-    basic_amount = ctc_amount * (basic_percent / 100)
-    hra_amount = basic_amount * hra_rate
-    pf_amount = basic_amount * (pf_percent / 100)
-    gratuity_amount = basic_amount * (gratuity_percent / 100)
-    bonus_amount = ctc_amount * (bonus_percent / 100)
-    lta_amount = ctc_amount * (lta_percent / 100)
-
-    # Calculate special allowance (balancing figure)
-    total_fixed = basic_amount + hra_amount + pf_amount + gratuity_amount + bonus_amount + lta_amount
-    special_allowance = max(0, ctc_amount - total_fixed)
-
-    # Create breakup dictionary
-    breakup = {
-        'Basic Salary': {
-            'amount': round(basic_amount, 2),
-            'percentage': round((basic_amount / ctc_amount) * 100, 2)
-        },
-        'HRA': {
-            'amount': round(hra_amount, 2),
-            'percentage': round((hra_amount / ctc_amount) * 100, 2)
-        },
-        'Special Allowance': {
-            'amount': round(special_allowance, 2),
-            'percentage': round((special_allowance / ctc_amount) * 100, 2)
-        },
-        'Employer PF': {
-            'amount': round(pf_amount, 2),
-            'percentage': round((pf_amount / ctc_amount) * 100, 2)
-        },
-        'Gratuity': {
-            'amount': round(gratuity_amount, 2),
-            'percentage': round((gratuity_amount / ctc_amount) * 100, 2)
-        },
-        'Bonus/Variable': {
-            'amount': round(bonus_amount, 2),
-            'percentage': round((bonus_amount / ctc_amount) * 100, 2)
-        },
-        'LTA/Other Benefits': {
-            'amount': round(lta_amount, 2),
-            'percentage': round((lta_amount / ctc_amount) * 100, 2)
-        }
-    }
+    hra_rate = hra_percent if hra_percent is not None else _HRA_BY_CITY.get(city_type, NON_METRO_HRA_RATE)
+
+    # Calculate components (order matches BREAKUP_COMPONENTS)
+    amounts = _get_amounts_kernel()(float(ctc_amount), float(basic_percent), float(hra_rate),
+                                   float(pf_percent), float(gratuity_percent),
+                                   float(bonus_percent), float(lta_percent))
+
+    # Python's round() on the same expressions as the original per-component
+    # code; np.round scales first and can land 0.01 away
+    raw = amounts.tolist()
+    percentages = np.array([round((amount / ctc_amount) * 100, 2) for amount in raw])
+    amounts = np.array([round(amount, 2) for amount in raw])
 
-    return breakup
+    return amounts, percentages
+
+def calculate_ctc_breakup(ctc_amount, city_type, basic_percent=None, hra_percent=None,
+                         pf_percent=None, gratuity_percent=None, bonus_percent=None, lta_percent=None):
+    """Calculate detailed CTC breakup"""
+    amounts, percentages = compute_breakup_arrays(ctc_amount, city_type, basic_percent, hra_percent,
+                                                  pf_percent, gratuity_percent, bonus_percent, lta_percent)
+    return Breakup(BREAKUP_COMPONENTS, amounts, percentages)
 
+@st.cache_data(max_entries=128, show_spinner=False)
 def validate_inputs(ctc_amount, basic_percent, pf_percent, gratuity_percent, bonus_percent, lta_percent):
     """Validate input parameters"""
     errors = []
+    append = errors.append
 
     # CTC validation
     if ctc_amount <= 0:
-        errors.append("CTC amount must be greater than 0")
+        append("CTC amount must be greater than 0")
     elif ctc_amount < MIN_CTC:
-        errors.append(f"CTC amount seems too low (minimum ₹{MIN_CTC:,})")
+        append(_CTC_LO_MSG)
     elif ctc_amount > MAX_CTC:
-        errors.append(f"CTC amount seems too high (maximum ₹{MAX_CTC:,})")
+        append(_CTC_HI_MSG)
 
     # Percentage validations
-    if basic_percent <= 0 or basic_percent > 100:
-        errors.append("Basic salary percentage must be between 0-100%")
-
-    if pf_percent < 0 or pf_percent > 100:
-        errors.append("PF percentage must be between 0-100%")
-
-    if gratuity_percent < 0 or gratuity_percent > 100:
-        errors.append("Gratuity percentage must be between 0-100%")
-
-    if bonus_percent < 0 or bonus_percent > 100:
-        errors.append("Bonus percentage must be between 0-100%")
-
-    if lta_percent < 0 or lta_percent > 100:
-        errors.append("LTA percentage must be between 0-100%")
+    values = (basic_percent, pf_percent, gratuity_percent, bonus_percent, lta_percent)
+    for value, (allow_zero, message) in zip(values, _PCT_CHECKS):
+        if value > 100 or value < 0 or (value == 0 and not allow_zero):
+            append(message)
 
     # Total percentage check
-    total_percent = basic_percent + pf_percent + gratuity_percent + bonus_percent + lta_percent
+    total_percent = sum(values)
     if total_percent > 120:
-        errors.append(f"Total percentages exceed reasonable limits ({total_percent:.1f}%)")
+        append(f"Total percentages exceed reasonable limits ({total_percent:.1f}%)")
 
     # Logical validations
-    if pf_percent > basic_percent:
-        errors.append("PF percentage cannot exceed Basic salary percentage")
-
-    if gratuity_percent > basic_percent:
-        errors.append("Gratuity percentage cannot exceed Basic salary percentage")
+    if pf_percent > basic_percent or gratuity_percent > basic_percent:
+        if pf_percent > basic_percent:
+            append("PF percentage cannot exceed Basic salary percentage")
+        if gratuity_percent > basic_percent:
+            append("Gratuity percentage cannot exceed Basic salary percentage")
 
     return errors
 
+# (threshold, divisor, format) from largest to smallest unit
+_FMT_SCALES = (
+    (10000000, 10000000, "₹{:.2f} Cr"),   # 1 crore
+    (100000, 100000, "₹{:.2f} L"),        # 1 lakh
+)
+
 def format_currency(amount):
     """Format amount as Indian currency"""
-    if amount >= 10000000:  # 1 crore
-        return f"₹{amount/10000000:.2f} Cr"
-    elif amount >= 100000:  # 1 lakh
-        return f"₹{amount/100000:.2f} L"
-    else:
-        return f"₹{amount:,.0f}"
-
-def create_pdf_report(breakup_data, ctc_amount, city_type):
-    """Generate PDF report of CTC breakup"""
+    for threshold, divisor, fmt in _FMT_SCALES:
+        if amount >= threshold:
+            return fmt.format(amount / divisor)
+    return f"₹{amount:,.0f}"
+
+# Sample CTCs for quick comparisons, with their labels formatted once
+SAMPLE_CTCS = (300000, 500000, 800000, 1000000, 1500000, 2000000)
+_SAMPLE_LABELS = {ctc: format_currency(ctc) for ctc in SAMPLE_CTCS}
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def render_breakup_table(ctc_amount, city_type, basic_percent=None, hra_percent=None,
+                         pf_percent=None, gratuity_percent=None, bonus_percent=None, lta_percent=None):
+    """Render the CTC breakup results as an HTML table"""
+    amounts, percentages = compute_breakup_arrays(ctc_amount, city_type, basic_percent, hra_percent,
+                                                  pf_percent, gratuity_percent, bonus_percent, lta_percent)
+    rows = "".join(
+        f"<tr><td>{component}</td><td>₹{amount:,.0f}</td>"
+        f"<td>{percentage:.2f}%</td><td>₹{amount / 12:,.0f}</td></tr>"
+        for component, amount, percentage in zip(BREAKUP_COMPONENTS, amounts, percentages)
+    )
+    return (
+        '<div class="results-table"><table>'
+        "<thead><tr><th>Component</th><th>Amount (₹)</th>"
+        "<th>Percentage (%)</th><th>Monthly (₹)</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table></div>"
+    )
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def create_csv_report(ctc_amount, city_type, basic_percent=None, hra_percent=None,
+                      pf_percent=None, gratuity_percent=None, bonus_percent=None, lta_percent=None):
+    """Generate CSV report of CTC breakup"""
+    amounts, percentages = compute_breakup_arrays(ctc_amount, city_type, basic_percent, hra_percent,
+                                                  pf_percent, gratuity_percent, bonus_percent, lta_percent)
+    csv_data = pd.DataFrame({'Component': BREAKUP_COMPONENTS, 'Amount': amounts, 'Percentage': percentages})
+    csv_buffer = BytesIO()
+    csv_data.to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue()
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def create_json_report(breakup_items, ctc_amount, city_type, generated_at):
+    """Generate JSON export of CTC breakup as bytes"""
+    payload = {
+        'ctc_amount': ctc_amount,
+        'city_type': city_type,
+        'breakup': {
+            component: {'amount': amount, 'percentage': percentage}
+            for component, amount, percentage in breakup_items
+        },
+        'generated_at': generated_at
+    }
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2).encode('utf-8')
+
+def _latin1(text):
+    """Make text safe for the core (latin-1) PDF fonts"""
+    return text.replace('₹', 'Rs.').encode('latin-1', 'replace').decode('latin-1')
+
+# PDF table header, pre-encoded for the core fonts
+_PDF_TABLE_HEADER = ((80, _latin1("Component")), (40, _latin1("Amount (₹)")), (30, _latin1("Percentage")))
+
+def _pdf_static_header(ctc_amount, city_type, generated_on):
+    """Return the report info lines, latin-1 safe"""
+    return (
+        _latin1(f"Total CTC: {format_currency(ctc_amount)}"),
+        _latin1(f"City Type: {city_type}"),
+        f"Generated on: {generated_on}",
+    )
+
+@st.cache_resource(show_spinner=False)
+def _get_fpdf():
+    """Import fpdf2 once per server process; None if it is not installed"""
     try:
-        from fpdf import FPDF
-        
+        from fpdf import FPDF, XPos, YPos
+    except ImportError:
+        return None
+    return FPDF, XPos, YPos
+
+def _text_report(breakup_items, ctc_amount, city_type, generated_on):
+    """Plain-text stand-in for the PDF report"""
+    content = f"""
+CTC BREAKUP REPORT
+==================
+
+Total CTC: {format_currency(ctc_amount)}
+City Type: {city_type}
+Generated on: {generated_on}
+
+Component Breakdown:
+-------------------
+"""
+    for component, amount, percentage in breakup_items:
+        content += f"{component:<25}: ₹{amount:>12,.0f} ({percentage:>6.2f}%)\n"
+
+    return content.encode('utf-8')
+
+def create_pdf_report(breakup_items, ctc_amount, city_type, generated_on):
+    """Generate PDF report of CTC breakup
+
+    breakup_items is a tuple of (component, amount, percentage) rows.
+    """
+    fpdf = _get_fpdf()
+    if fpdf is None:
+        return _text_report(breakup_items, ctc_amount, city_type, generated_on)
+    FPDF, XPos, YPos = fpdf
+
+    try:
+        # Positional text and new_x/new_y keep cell() off fpdf2's deprecation
+        # shims for txt=/ln=, and helvetica is the core font Arial maps to
         pdf = FPDF()
         pdf.add_page()
-        pdf.set_font("Arial", size=16)
+        pdf.set_font("helvetica", size=16)
 
         # Title
-        pdf.cell(200, 10, txt="CTC Breakup Report", ln=1, align='C')
+        pdf.cell(200, 10, "CTC Breakup Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
         pdf.ln(10)
 
         # Basic info
-        pdf.set_font("Arial", size=12)
-        pdf.cell(200, 10, txt=f"Total CTC: {format_currency(ctc_amount)}", ln=1)
-        pdf.cell(200, 10, txt=f"City Type: {city_type}", ln=1)
-        pdf.cell(200, 10, txt=f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=1)
+        pdf.set_font("helvetica", size=12)
+        for line in _pdf_static_header(ctc_amount, city_type, generated_on):
+            pdf.cell(200, 10, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.ln(10)
 
         # Table header
-        pdf.set_font("Arial", 'B', 12)
-        pdf.cell(80, 10, txt="Component", border=1)
-        pdf.cell(40, 10, txt="Amount (₹)", border=1)
-        pdf.cell(30, 10, txt="Percentage", border=1)
+        pdf.set_font("helvetica", 'B', 12)
+        for width, title in _PDF_TABLE_HEADER:
+            pdf.cell(width, 10, title, border=1)
         pdf.ln()
 
         # Table data
-        pdf.set_font("Arial", size=10)
-        for component, data in breakup_data.items():
-            pdf.cell(80, 8, txt=component, border=1)
-            pdf.cell(40, 8, txt=f"{data['amount']:,.0f}", border=1)
-            pdf.cell(30, 8, txt=f"{data['percentage']:.2f}%", border=1)
+        pdf.set_font("helvetica", size=10)
+        for component, amount, percentage in breakup_items:
+            pdf.cell(80, 8, _latin1(component), border=1)
+            pdf.cell(40, 8, f"{amount:,.0f}", border=1)
+            pdf.cell(30, 8, f"{percentage:.2f}%", border=1)
             pdf.ln()
 
-        return pdf.output(dest='S').encode('latin-1')
-    except Exception as e:
+        # fpdf2 returns the document as a bytearray
+        return bytes(pdf.output())
+    except Exception:
         # Fallback to text report if PDF fails
-        content = f"""
-CTC BREAKUP REPORT
-==================
-
-Total CTC: {format_currency(ctc_amount)}
-City Type: {city_type}
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-Component Breakdown:
--------------------
-"""
-        for component, data in breakup_data.items():
-            content += f"{component:<25}: ₹{data['amount']:>12,.0f} ({data['percentage']:>6.2f}%)\n"
-        
-        return content.encode('utf-8')
+        return _text_report(breakup_items, ctc_amount, city_type, generated_on)
 
 # =====================================================
 # STREAMLIT APPLICATION
@@ -232,86 +483,56 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Calculator inputs restored by "Reset to Defaults"
+_CALC_DEFAULTS = {
+    'ctc_amount': 1000000.0,
+    'city_type': "Metro",
+    'basic_percent': DEFAULT_PERCENTAGES['basic'],
+    'hra_percent': None,
+    'pf_percent': DEFAULT_PERCENTAGES['pf'],
+    'gratuity_percent': DEFAULT_PERCENTAGES['gratuity'],
+    'bonus_percent': DEFAULT_PERCENTAGES['bonus'],
+    'lta_percent': DEFAULT_PERCENTAGES['lta'],
+}
+# ctc_input_version is part of the CTC input keys; bumping it rebuilds the
+# inputs from ctc_amount instead of keeping the last typed value
+_SESSION_DEFAULTS = {**_CALC_DEFAULTS, 'dark_mode': False, 'ctc_input_version': 0}
+
 # Initialize session state
 def initialize_session_state():
-    defaults = {
-        'ctc_amount': 1000000.0,
-        'city_type': "Metro",
-        'basic_percent': DEFAULT_PERCENTAGES['basic'],
-        'hra_percent': None,
-        'pf_percent': DEFAULT_PERCENTAGES['pf'],
-        'gratuity_percent': DEFAULT_PERCENTAGES['gratuity'],
-        'bonus_percent': DEFAULT_PERCENTAGES['bonus'],
-        'lta_percent': DEFAULT_PERCENTAGES['lta'],
-        'dark_mode': False
-    }
-    
-    for key, value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+    if not st.session_state.get('_init_done'):
+        st.session_state.update(_SESSION_DEFAULTS)
+        st.session_state['_init_done'] = True
+
+def set_ctc_amount(amount):
+    """Set the CTC from code and rebuild the CTC inputs to show it"""
+    st.session_state.ctc_amount = float(amount)
+    st.session_state.ctc_input_version += 1
+
+def apply_sample_ctc():
+    """Load the picked quick-comparison CTC into the calculator"""
+    if st.session_state.sample_pick is None:
+        return
+    set_ctc_amount(st.session_state.sample_pick)
+    # Clear the pick so the same sample can be chosen again
+    st.session_state.sample_pick = None
 
 def main():
     initialize_session_state()
 
+    # One timestamp per rerun so all exports agree
+    now = datetime.now()
+    ts_compact = now.strftime('%Y%m%d_%H%M%S')
+    ts_pretty = now.strftime('%Y-%m-%d %H:%M:%S')
+
     # Custom CSS for better styling
-    st.markdown("""
-    <style>
-    .main-header {
-        background: linear-gradient(90deg, #4CAF50, #45a049);
-        padding: 1rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background: #f0f2f6;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 4px solid #4CAF50;
-    }
-    .results-table {
-        border: 1px solid #ddd;
-        border-radius: 10px;
-        overflow: hidden;
-    }
-    .warning-box {
-        background: #fff3cd;
-        border: 1px solid #ffeaa7;
-        border-radius: 5px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-   .streamlit-info {
-    background: #263238; /* blue-gray background */
-    border-left: 4px solid #00acc1;  /* cyan accent */
-    padding: 1rem;
-    margin: 1rem 0;
-    border-radius: 5px;
-    color: #e0f7fa;  /* Light text for readability */
-}
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_CSS_BLOCK, unsafe_allow_html=True)
 
     # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>💰 CTC Breakup Calculator</h1>
-        <p>Calculate detailed Cost to Company breakdown with Indian salary standards</p>
-        <small>🌟 Hosted on Streamlit Cloud - Always Available</small>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
     # Streamlit Cloud information banner
-    st.markdown("""
-    <div class="streamlit-info">
-        <h4>🌟  Online CTC Calculator!</h4>
-        <p>✅ Easier calculation of pesky salaries <br>
-        📱 Share this URL with anyone<br>
-        💾 Download reports anytime<br>
-        🔄 Now know exacly what 30 LPA means </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_INFO_BANNER, unsafe_allow_html=True)
 
     # Sidebar for inputs
     with st.sidebar:
@@ -329,12 +550,14 @@ def main():
 
         if input_type == "LPA (Lakhs Per Annum)":
             lpa_value = st.number_input("CTC in LPA:", min_value=0.1, max_value=1000.0,
-                                       value=st.session_state.ctc_amount/100000, step=0.1)
+                                       value=st.session_state.ctc_amount/100000, step=0.1,
+                                       key=f"ctc_lpa_{st.session_state.ctc_input_version}")
             st.session_state.ctc_amount = lpa_value * 100000
         else:
             st.session_state.ctc_amount = st.number_input("CTC Amount (₹):", min_value=10000.0,
                                                          max_value=100000000.0,
-                                                         value=st.session_state.ctc_amount, step=1000.0)
+                                                         value=st.session_state.ctc_amount, step=1000.0,
+                                                         key=f"ctc_abs_{st.session_state.ctc_input_version}")
 
         st.session_state.city_type = st.selectbox("City Type:", ["Metro", "Non-Metro"],
                                                   index=0 if st.session_state.city_type == "Metro" else 1)
@@ -351,7 +574,7 @@ def main():
                                                        st.session_state.basic_percent, 0.1)
 
             # HRA calculation based on city type
-            default_hra = METRO_HRA_RATE if st.session_state.city_type == "Metro" else NON_METRO_HRA_RATE
+            default_hra = _HRA_BY_CITY.get(st.session_state.city_type, NON_METRO_HRA_RATE)
             hra_of_basic = st.slider("HRA (% of Basic):", 20.0, 60.0, default_hra*100, 0.1)
             st.session_state.hra_percent = hra_of_basic / 100
 
@@ -374,10 +597,8 @@ def main():
 
         # Reset button
         if st.button("🔄 Reset to Defaults", use_container_width=True):
-            for key in ['ctc_amount', 'city_type', 'basic_percent', 'hra_percent',
-                       'pf_percent', 'gratuity_percent', 'bonus_percent', 'lta_percent']:
-                if key in st.session_state:
-                    del st.session_state[key]
+            st.session_state.update(_CALC_DEFAULTS)
+            st.session_state.ctc_input_version += 1
             st.rerun()
 
         # Quick preset buttons
@@ -386,13 +607,13 @@ def main():
         col1, col2 = st.columns(2)
         with col1:
             if st.button("👨‍💼 Standard", use_container_width=True):
-                st.session_state.ctc_amount = 1000000
+                set_ctc_amount(1000000)
                 st.session_state.city_type = "Metro"
                 st.rerun()
 
         with col2:
             if st.button("🚀 Senior", use_container_width=True):
-                st.session_state.ctc_amount = 2000000
+                set_ctc_amount(2000000)
                 st.session_state.city_type = "Metro"
                 st.rerun()
 
@@ -402,27 +623,20 @@ def main():
         preset_col1, preset_col2 = st.columns(2)
         with preset_col1:
             if st.button("🎓 Entry Level", use_container_width=True):
-                st.session_state.ctc_amount = 500000
+                set_ctc_amount(500000)
                 st.session_state.city_type = "Non-Metro"
                 st.rerun()
 
         with preset_col2:
             if st.button("💎 Executive", use_container_width=True):
-                st.session_state.ctc_amount = 3000000
+                set_ctc_amount(3000000)
                 st.session_state.city_type = "Metro"
                 st.rerun()
 
         # App info
         st.divider()
         st.markdown("### 📱 Share This App")
-        st.info("""
-        **Features:**
-        • Always online (24/7)
-        • Real-time calculations
-        • Export to PDF/CSV/JSON
-        • Mobile-friendly design
-        • Professional reports
-        """)
+        st.info(_SIDEBAR_FEATURES)
 
     # Main content
     col1, col2 = st.columns([2, 1])
@@ -444,7 +658,7 @@ def main():
                 st.error(f"• {error}")
         else:
             # Calculate breakup
-            breakup = calculate_ctc_breakup(
+            breakup_args = (
                 st.session_state.ctc_amount,
                 st.session_state.city_type,
                 st.session_state.basic_percent,
@@ -454,29 +668,19 @@ def main():
                 st.session_state.bonus_percent,
                 st.session_state.lta_percent
             )
+            breakup = calculate_ctc_breakup(*breakup_args)
 
             # Results table
             st.subheader("📋 CTC Breakup Results")
 
-            # Create styled DataFrame
-            df_data = []
-            for component, data in breakup.items():
-                df_data.append({
-                    'Component': component,
-                    'Amount (₹)': f"₹{data['amount']:,.0f}",
-                    'Percentage (%)': f"{data['percentage']:.2f}%",
-                    'Monthly (₹)': f"₹{data['amount']/12:,.0f}"
-                })
-
-            df = pd.DataFrame(df_data)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.markdown(render_breakup_table(*breakup_args), unsafe_allow_html=True)
 
             # Summary metrics
             st.subheader("📊 Key Metrics")
 
-            basic_amount = breakup['Basic Salary']['amount']
-            hra_amount = breakup['HRA']['amount']
-            take_home = basic_amount + hra_amount + breakup['Special Allowance']['amount']
+            basic_amount = breakup.amounts[BASIC_IDX]
+            hra_amount = breakup.amounts[HRA_IDX]
+            take_home = basic_amount + hra_amount + breakup.amounts[SPECIAL_IDX]
 
             metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
 
@@ -510,7 +714,7 @@ def main():
                 st.info(f"💼 **Tax Bracket**: {tax_bracket}")
 
                 # PF analysis
-                pf_employee = breakup['Employer PF']['amount']
+                pf_employee = breakup.amounts[PF_IDX]
                 st.info(f"🏦 **Employee PF**: ₹{pf_employee:,.0f} (deducted from salary)")
 
             with insight_col2:
@@ -521,7 +725,7 @@ def main():
                     st.warning("🌆 **Non-Metro**: Lower HRA (40% of Basic)")
 
                 # Special allowance analysis
-                special_pct = breakup['Special Allowance']['percentage']
+                special_pct = breakup.percentages[SPECIAL_IDX]
                 if special_pct > 30:
                     st.warning(f"⚠️ **High Special Allowance**: {special_pct:.1f}% - Consider rebalancing")
                 else:
@@ -532,43 +736,44 @@ def main():
 
         if not validation_errors:
             # CSV Download
-            csv_data = pd.DataFrame([(k, v['amount'], v['percentage']) for k, v in breakup.items()],
-                                   columns=['Component', 'Amount', 'Percentage'])
-            csv_buffer = BytesIO()
-            csv_data.to_csv(csv_buffer, index=False)
-
             st.download_button(
                 label="📄 Download CSV Report",
-                data=csv_buffer.getvalue(),
-                file_name=f"ctc_breakup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                data=create_csv_report(*breakup_args),
+                file_name=f"ctc_breakup_{ts_compact}.csv",
                 mime="text/csv",
                 use_container_width=True
             )
 
-            # PDF Download
-            pdf_data = create_pdf_report(breakup, st.session_state.ctc_amount, st.session_state.city_type)
+            # PDF Download (only built on request, it is the heaviest export)
+            breakup_items = tuple(zip(breakup.names, breakup.amounts.tolist(), breakup.percentages.tolist()))
+            pdf_key = (breakup_items, st.session_state.city_type)
 
-            if pdf_data:
+            if st.button("📑 Prepare PDF Report", use_container_width=True):
+                pdf_data = create_pdf_report(breakup_items, st.session_state.ctc_amount,
+                                             st.session_state.city_type, ts_pretty)
+                st.session_state['_pdf_report'] = (pdf_key, pdf_data, ts_compact)
+
+            # Only offer a prepared PDF while it still matches the inputs
+            pdf_report = st.session_state.get('_pdf_report')
+            if pdf_report and pdf_report[0] == pdf_key:
                 st.download_button(
                     label="📑 Download PDF Report",
-                    data=pdf_data,
-                    file_name=f"ctc_breakup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                    data=pdf_report[1],
+                    file_name=f"ctc_breakup_{pdf_report[2]}.pdf",
                     mime="application/pdf",
                     use_container_width=True
                 )
 
-            # JSON Export
-            json_data = json.dumps({
-                'ctc_amount': st.session_state.ctc_amount,
-                'city_type': st.session_state.city_type,
-                'breakup': breakup,
-                'generated_at': datetime.now().isoformat()
-            }, indent=2)
+            # JSON Export (timestamp bucketed to the minute so reruns hit the cache)
+            json_data = create_json_report(
+                breakup_items, st.session_state.ctc_amount, st.session_state.city_type,
+                now.replace(second=0, microsecond=0).isoformat()
+            )
 
             st.download_button(
                 label="📋 Download JSON Data",
                 data=json_data,
-                file_name=f"ctc_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                file_name=f"ctc_data_{ts_compact}.json",
                 mime="application/json",
                 use_container_width=True
             )
@@ -587,51 +792,12 @@ def main():
         # Sample calculations for different CTCs
         st.subheader("📊 Quick Comparisons")
 
-        sample_ctcs = [300000, 500000, 800000, 1000000, 1500000, 2000000]
-
-        for sample_ctc in sample_ctcs:
-            if st.button(f"Calculate for {format_currency(sample_ctc)}", 
-                        key=f"sample_{sample_ctc}", use_container_width=True):
-                st.session_state.ctc_amount = sample_ctc
-                st.rerun()
+        st.radio("Calculate for:", SAMPLE_CTCS, format_func=_SAMPLE_LABELS.get,
+                 index=None, horizontal=True, key='sample_pick', on_change=apply_sample_ctc)
 
     # Formulas and explanations
     with st.expander("📐 Calculation Formulas & Methodology"):
-        st.markdown("""
-        ### 🧮 Calculation Formulas
-
-        **Basic Components:**
-        - **Basic Salary** = CTC × Basic %
-        - **HRA** = Basic Salary × HRA Rate
-          - 🏙️ Metro: 50% of Basic
-          - 🌆 Non-Metro: 40% of Basic
-
-        **Statutory Components:**
-        - **Employer PF** = Basic Salary × 12%
-        - **Gratuity** = Basic Salary × 4.81%
-
-        **Benefits & Allowances:**
-        - **Bonus/Variable** = CTC × Bonus %
-        - **LTA/Other Benefits** = CTC × LTA %
-
-        **Balancing Figure:**
-        - **Special Allowance** = CTC - (Sum of all other components)
-
-        ### 📋 Important Notes:
-
-        1. **HRA Calculation**: Based on city classification (Metro vs Non-Metro)
-        2. **PF & Gratuity**: Always calculated on Basic Salary
-        3. **Special Allowance**: Automatically balances to make total = CTC
-        4. **Tax Implications**: Higher Special Allowance = Higher tax burden
-        5. **Take-Home Estimate**: Excludes employee PF, professional tax, and income tax
-
-        ### 🎯 Optimization Tips:
-
-        - **Increase Basic**: Higher PF contribution, better retirement corpus
-        - **Optimize HRA**: Claim house rent allowance for tax benefits
-        - **Balance Special Allowance**: Keep under 30% for better tax efficiency
-        - **Utilize Benefits**: LTA and other allowances have tax advantages
-        """)
+        st.markdown(_FORMULAS_MD)
 
     # Footer with additional information
     st.divider()
@@ -639,40 +805,19 @@ def main():
     footer_col1, footer_col2, footer_col3 = st.columns(3)
 
     with footer_col1:
-        st.markdown("""
-        **🔧 Built with:**
-        - Streamlit for UI
-        - Python for calculations
-        - Pandas for data handling
-        - FPDF2 for PDF reports
-        """)
+        st.markdown(_FOOTER_BUILT_WITH)
 
     with footer_col2:
-        st.markdown("""
-        **📊 Features:**
-        - Real-time calculations
-        - Export to CSV/PDF/JSON
-        - Mobile-friendly design
-        - Always online (24/7)
-        """)
+        st.markdown(_FOOTER_FEATURES)
 
     with footer_col3:
-        st.markdown("""
-        **🇮🇳 Indian Standards:**
-        - PF regulations compliant
-        - Metro/Non-Metro HRA rates
-        - Statutory benefits included
-        """)
+        st.markdown(_FOOTER_STANDARDS)
 
     st.markdown("---")
     st.markdown("Made with ❤️ for Indian professionals by DANUSH VIKRAMAN SB | Version 2.1 | 🌟 Hosted on Streamlit Cloud")
 
     # Usage analytics (optional)
-    st.markdown("""
-    <div style="text-align: center; color: #666; font-size: 12px; margin-top: 20px;">
-        💡 Tip: Bookmark this page for quick access to CTC calculations anytime!
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 # Run the main app
 if __name__ == "__main__":